@@ -1,10 +1,17 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 import yfinance as yf
-import pandas as pd
-from datetime import datetime, timedelta
-import math
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import time
 
-app = FastAPI()
+from strategies.option_backtest import (
+    STRIKE_STEP, SIGNAL_NAMES,
+    add_indicators, column_arrays, final_signal,
+    option_premium, pick_strike, run_trades,
+)
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # ================= CONFIG =================
 
@@ -16,147 +23,57 @@ INDEX_MAP = {
     "FINNIFTY": "NIFTY_FIN_SERVICE.NS"
 }
 
-STRIKE_STEP = {
-    "NIFTY": 50,
-    "FINNIFTY": 50,
-    "BANKNIFTY": 100
-}
-
-# ================= UTIL =================
-
-def safe(v):
-    try:
-        if v is None or pd.isna(v):
-            return None
-        return float(v)
-    except:
-        return None
-
-def nearest_strike(price, step):
-    return int(round(price / step) * step)
-
-def next_expiry():
-    today = datetime.now()
-    days = (3 - today.weekday()) % 7
-    if days == 0:
-        days = 7
-    return (today + timedelta(days=days)).strftime("%d-%b-%Y")
-
-# ================= INDICATORS =================
-
-def add_indicators(df):
-    df["EMA9"] = df["Close"].ewm(span=9).mean()
-    df["EMA21"] = df["Close"].ewm(span=21).mean()
-
-    delta = df["Close"].diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    rs = gain.rolling(14).mean() / loss.rolling(14).mean()
-    df["RSI"] = 100 - (100 / (1 + rs))
-    return df
-
-# ================= STRATEGY =================
-
-def ema_signal(row, prev):
-    if prev is None:
-        return "NONE"
-    if prev["EMA9"] < prev["EMA21"] and row["EMA9"] > row["EMA21"]:
-        return "BUY"
-    if prev["EMA9"] > prev["EMA21"] and row["EMA9"] < row["EMA21"]:
-        return "SELL"
-    return "NONE"
-
-def rsi_filter(row):
-    if row["RSI"] is None:
-        return "NONE"
-    if row["RSI"] < 30:
-        return "BUY"
-    if row["RSI"] > 70:
-        return "SELL"
-    return "NONE"
-
-def final_signal(row, prev):
-    s1 = ema_signal(row, prev)
-    s2 = rsi_filter(row)
-    return s1 if s1 == s2 else "NONE"
-
-# ================= OPTION LOGIC =================
-
-def option_premium(spot):
-    return max(40, spot * 0.004)
-
-def option_delta(option_type):
-    return 0.55 if option_type == "CE" else -0.55
-
-def pick_strike(spot, step, mode):
-    atm = nearest_strike(spot, step)
-    if mode == "ATM":
-        return atm
-    if mode == "ITM":
-        return atm - step
-    if mode == "OTM":
-        return atm + step
-    return atm
-
-def start_option_trade(signal, spot, symbol, mode="ATM"):
-    step = STRIKE_STEP[symbol]
-    opt_type = "CE" if signal == "BUY" else "PE"
-    strike = pick_strike(spot, step, mode)
-    premium = option_premium(spot)
-    delta = option_delta(opt_type)
-
-    if abs(delta) < 0.4:
-        return None  # Delta filter
-
-    return {
-        "symbol": symbol,
-        "expiry": next_expiry(),
-        "strike": strike,
-        "type": opt_type,
-        "entry": round(premium, 2),
-        "sl": round(premium * 0.7, 2),
-        "target": round(premium * 1.5, 2),
-        "trail": False,
-        "status": "OPEN"
-    }
-
-def manage_trade(trade, premium):
-    entry = trade["entry"]
-
-    if not trade["trail"] and premium >= entry * 1.1:
-        trade["sl"] = entry
-        trade["trail"] = True
+CANDLE_LIMIT = 120  # candles returned by /chart, as columns
 
-    if trade["trail"]:
-        trade["sl"] = max(trade["sl"], premium * 0.95)
-
-    if premium <= trade["sl"]:
-        trade["status"] = "SL HIT"
-
-    if premium >= trade["target"]:
-        trade["status"] = "TARGET HIT"
-
-    return trade
+CACHE_TTL = 60  # seconds; intraday bars only advance every 5m
 
 # ================= DATA FETCH =================
 
+_FETCH_CACHE = {}      # (symbol, interval, period) -> (fetched_at, (df, status))
+_INDICATOR_CACHE = {}  # (symbol, interval, period) -> (raw df, df with indicators)
+
 def fetch(symbol, interval="5m", period="7d"):
-    yf_symbol = INDEX_MAP[symbol]
+    key = (symbol, interval, period)
+    fetched_at, cached = _FETCH_CACHE.get(key, (0, None))
+    if time.time() - fetched_at < CACHE_TTL:
+        return cached
+    _FETCH_CACHE.pop(key, None)
+
+    result = download(symbol, interval, period)
+    _FETCH_CACHE[key] = (time.time(), result)
+    return result
+
+def fetch_with_indicators(symbol, interval="5m", period="7d"):
+    df, status = fetch(symbol, interval, period)
+    key = (symbol, interval, period)
+    raw, ind = _INDICATOR_CACHE.get(key, (None, None))
+    # Recompute only when fetch() handed back a fresh frame
+    if raw is not df:
+        ind = add_indicators(df)
+        _INDICATOR_CACHE[key] = (df, ind)
+    return ind, status
+
+def download(symbol, interval="5m", period="7d"):
+    # Ticker.history rather than yf.download: download() keeps per-ticker
+    # results in module-global state, so concurrent calls for the same
+    # symbol can clobber each other.
+    ticker = yf.Ticker(INDEX_MAP[symbol])
     try:
-        df = yf.download(yf_symbol, interval=interval, period=period, progress=False)
+        df = ticker.history(interval=interval, period=period)
         if df.empty:
             raise ValueError("Empty data")
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        df = df.reset_index()
-        return df, "LIVE"
+        status = "LIVE"
     except Exception as e:
         # Fallback to last available daily candle
-        df = yf.download(yf_symbol, interval="1d", period="5d", progress=False)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        df = df.reset_index()
-        return df, "MARKET CLOSED"
+        df = ticker.history(interval="1d", period="5d")
+        status = "MARKET CLOSED"
+
+    # Only Close feeds the strategy; it stays float64 since spot, premium
+    # and strikes are priced from it. Daily candles index on "Date",
+    # normalise to "Datetime".
+    df = df.rename_axis("Datetime").reset_index()
+    df = df[["Datetime", "Close"]]
+    return df, status
 
 # ================= API =================
 
@@ -170,56 +87,44 @@ def chart(symbol: str):
     if symbol not in INDEX_MAP:
         return {"error": "Only index options supported"}
 
-    df5, status5 = fetch(symbol, "5m")
-    df15, status15 = fetch(symbol, "15m")
+    # 5m and 15m are independent Yahoo round-trips, overlap them
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        f5 = pool.submit(fetch_with_indicators, symbol, "5m")
+        f15 = pool.submit(fetch_with_indicators, symbol, "15m")
+        df5, status5 = f5.result()
+        df15, status15 = f15.result()
 
     market_status = "LIVE" if status5 == "LIVE" and status15 == "LIVE" else "MARKET CLOSED"
 
-    df5 = add_indicators(df5)
-    df15 = add_indicators(df15)
+    n = min(len(df5), len(df15))
 
-    capital = START_CAPITAL
-    trade = None
-    journal = []
-    candles = []
+    e9_5, e21_5, rsi5, close5 = column_arrays(df5, "EMA9", "EMA21", "RSI", "Close")
+    e9_15, e21_15, rsi15 = column_arrays(df15, "EMA9", "EMA21", "RSI")
 
-    for i in range(1, min(len(df5), len(df15))):
-        r5, p5 = df5.iloc[i], df5.iloc[i-1]
-        r15, p15 = df15.iloc[i], df15.iloc[i-1]
+    sig5 = final_signal(e9_5, e21_5, rsi5)[:n]
+    sig15 = final_signal(e9_15, e21_15, rsi15)[:n]
+    signals = np.where(sig5 == sig15, sig5, 0).astype(np.int8)
 
-        row5 = {"EMA9": safe(r5["EMA9"]), "EMA21": safe(r5["EMA21"]), "RSI": safe(r5["RSI"])}
-        prev5 = {"EMA9": safe(p5["EMA9"]), "EMA21": safe(p5["EMA21"]), "RSI": safe(p5["RSI"])}
+    premiums = option_premium(close5[:n])
+    strikes = pick_strike(close5[:n], STRIKE_STEP[symbol], "ATM")
 
-        row15 = {"EMA9": safe(r15["EMA9"]), "EMA21": safe(r15["EMA21"]), "RSI": safe(r15["RSI"])}
-        prev15 = {"EMA9": safe(p15["EMA9"]), "EMA21": safe(p15["EMA21"]), "RSI": safe(p15["RSI"])}
-
-        sig5 = final_signal(row5, prev5)
-        sig15 = final_signal(row15, prev15)
-
-        signal = sig5 if sig5 == sig15 else "NONE"
-
-        spot = safe(r5["Close"])
-        premium = option_premium(spot)
-
-        if trade is None and signal != "NONE":
-            trade = start_option_trade(signal, spot, symbol, mode="ATM")
+    # Trade management needs every bar, but only the tail is returned
+    start = max(1, n - CANDLE_LIMIT)
+    spots = close5[start:n]
+    candles = {
+        "time": [t.isoformat() for t in df5["Datetime"].iloc[start:n]],
+        "spot": np.where(np.isnan(spots), None, spots).tolist(),
+        "premium": [round(p, 2) for p in premiums[start:].tolist()],
+        "signal": [SIGNAL_NAMES[s] for s in signals[start:n]],
+    }
 
-        if trade:
-            trade = manage_trade(trade, premium)
-            if trade["status"] != "OPEN":
-                pnl = premium - trade["entry"]
-                capital += pnl
-                journal.append({**trade, "exit": round(premium, 2), "pnl": round(pnl, 2)})
-                trade = None
+    capitals, trade_ids, trades, journal = run_trades(
+        signals, premiums, strikes, symbol, START_CAPITAL
+    )
+    capital = capitals[-1] if n else START_CAPITAL
 
-        candles.append({
-            "time": r5["Datetime"].isoformat(),
-            "spot": spot,
-            "premium": round(premium, 2),
-            "signal": signal,
-            "capital": round(capital, 2),
-            "trade": trade
-        })
+    candles["capital"] = [round(c, 2) for c in capitals[start:].tolist()]
+    candles["trade"] = [trades[t] if t >= 0 else None for t in trade_ids[start:].tolist()]
 
     last_data_time = df5["Datetime"].iloc[-1].isoformat() if not df5.empty else None
 
@@ -227,7 +132,7 @@ def chart(symbol: str):
         "symbol": symbol,
         "market_status": market_status,
         "last_data_time": last_data_time,
-        "capital": round(capital, 2),
+        "capital": round(float(capital), 2),
         "journal": journal,
-        "candles": candles[-120:]
+        "candles": candles
     }
@@ -0,0 +1,248 @@
+# Indicator and backtest kernels, compiled with numba when available.
+# TA-Lib is deliberately not used: its EMA/MACD are seeded with an SMA and
+# BBANDS uses the population std, so it would not reproduce the pandas
+# definitions (adjust=True ewm, rolling std with ddof=1) these kernels match.
+# TA-Lib's RSI is the same Wilder RSI as _wilder_rsi.
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+@njit(cache=True)
+def _wilder_rsi(close, period):
+    """
+    Wilder's RSI: seeded with the simple average of the first `period`
+    moves, then smoothed recursively with alpha = 1/period.
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan, dtype=close.dtype)
+    avg_gain = avg_loss = 0.0
+
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta != delta:
+            delta = 0.0
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss > 0.0:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0.0:
+            rsi[i] = 100.0
+
+    return rsi
+
+
+@njit(cache=True)
+def _ema_rsi(close, span1, span2, period):
+    """
+    EMA(span1), EMA(span2) and Wilder RSI(period) of `close`.
+    EMAs match pandas `ewm(span=...).mean()` (adjust=True). Outputs take
+    the dtype of `close`; running state is kept in float64.
+    """
+    n = close.shape[0]
+    ema1 = np.empty(n, dtype=close.dtype)
+    ema2 = np.empty(n, dtype=close.dtype)
+
+    a1 = 1.0 - 2.0 / (span1 + 1.0)
+    a2 = 1.0 - 2.0 / (span2 + 1.0)
+    num1 = den1 = num2 = den2 = 0.0
+
+    for i in range(n):
+        c = close[i]
+        num1 *= a1
+        den1 *= a1
+        num2 *= a2
+        den2 *= a2
+        if c == c:
+            num1 += c
+            den1 += 1.0
+            num2 += c
+            den2 += 1.0
+        ema1[i] = num1 / den1 if den1 > 0.0 else np.nan
+        ema2[i] = num2 / den2 if den2 > 0.0 else np.nan
+
+    return ema1, ema2, _wilder_rsi(close, period)
+
+
+@njit(cache=True)
+def _all_indicators(high, low, close, volume):
+    """
+    Every indicator used by `fetch_data` in one pass over the candles:
+    EMA9, EMA21, VWAP, MACD, MACD_SIGNAL, MACD_HIST, RSI, BB_UPPER, BB_LOWER.
+    EMAs match pandas `ewm(span=...).mean()` (adjust=True) and the
+    Bollinger std is the rolling(20) sample std, kept with sliding Welford.
+    """
+    n = close.shape[0]
+    ema9 = np.empty(n)
+    ema21 = np.empty(n)
+    vwap = np.full(n, np.nan)
+    macd = np.empty(n)
+    macd_signal = np.empty(n)
+    bb_upper = np.full(n, np.nan)
+    bb_lower = np.full(n, np.nan)
+
+    a9 = 1.0 - 2.0 / 10.0
+    a21 = 1.0 - 2.0 / 22.0
+    a12 = 1.0 - 2.0 / 13.0
+    a26 = 1.0 - 2.0 / 27.0
+    num9 = den9 = num21 = den21 = 0.0
+    num12 = den12 = num26 = den26 = 0.0
+    num_sig = den_sig = 0.0
+    tp_v_sum = v_sum = 0.0
+    window = 20
+    bb_count = 0
+    bb_mean = bb_m2 = 0.0
+
+    for i in range(n):
+        c = close[i]
+        valid = c == c
+
+        # EMAs / MACD
+        num9 *= a9
+        den9 *= a9
+        num21 *= a21
+        den21 *= a21
+        num12 *= a12
+        den12 *= a12
+        num26 *= a26
+        den26 *= a26
+        if valid:
+            num9 += c
+            den9 += 1.0
+            num21 += c
+            den21 += 1.0
+            num12 += c
+            den12 += 1.0
+            num26 += c
+            den26 += 1.0
+        ema9[i] = num9 / den9 if den9 > 0.0 else np.nan
+        ema21[i] = num21 / den21 if den21 > 0.0 else np.nan
+        m = (num12 / den12 - num26 / den26) if den12 > 0.0 else np.nan
+        macd[i] = m
+
+        num_sig *= a9
+        den_sig *= a9
+        if m == m:
+            num_sig += m
+            den_sig += 1.0
+        macd_signal[i] = num_sig / den_sig if den_sig > 0.0 else np.nan
+
+        # VWAP
+        tp_v = (high[i] + low[i] + c) / 3.0 * volume[i]
+        if volume[i] == volume[i]:
+            v_sum += volume[i]
+        if tp_v == tp_v:
+            tp_v_sum += tp_v
+            if v_sum != 0.0:
+                vwap[i] = tp_v_sum / v_sum
+
+        # Bollinger Bands: drop the bar leaving the window, add the new one
+        if i >= window:
+            old = close[i - window]
+            if old == old:
+                bb_count -= 1
+                if bb_count == 0:
+                    bb_mean = bb_m2 = 0.0
+                else:
+                    d = old - bb_mean
+                    bb_mean -= d / bb_count
+                    bb_m2 -= d * (old - bb_mean)
+        if valid:
+            bb_count += 1
+            d = c - bb_mean
+            bb_mean += d / bb_count
+            bb_m2 += d * (c - bb_mean)
+        if bb_count == window:
+            std = np.sqrt(max(bb_m2, 0.0) / (window - 1))
+            bb_upper[i] = bb_mean + 2.0 * std
+            bb_lower[i] = bb_mean - 2.0 * std
+
+    macd_hist = macd - macd_signal
+    rsi = _wilder_rsi(close, 14)
+    return ema9, ema21, vwap, macd, macd_signal, macd_hist, rsi, bb_upper, bb_lower
+
+
+@njit(cache=True)
+def _fsm(signal, premium, entry_px, sl_px, target_px, start_capital):
+    """
+    Option trade state machine: at most one open trade, entered on a
+    non-zero signal and managed on every bar (breakeven at +10%, then a
+    5% trailing SL; exit on SL or the 1.5x target).
+
+    `entry_px`, `sl_px` and `target_px` are the per-bar entry levels,
+    already rounded by the caller (numba's round() is not Python's).
+
+    Returns per-bar `capital` and `trade_id` (trade open after the bar,
+    -1 if none), plus per-trade `entry_idx`, `exit_idx` (-1 while open),
+    final `sl`, `trail` and `status` (0 OPEN, 1 SL HIT, 2 TARGET HIT).
+    """
+    n = signal.shape[0]
+    capital = np.empty(n)
+    trade_id = np.full(n, -1, dtype=np.int32)
+    entry_idx = np.empty(n, dtype=np.int32)
+    exit_idx = np.full(n, -1, dtype=np.int32)
+    sl_out = np.empty(n)
+    trail_out = np.zeros(n, dtype=np.bool_)
+    status_out = np.zeros(n, dtype=np.int8)
+
+    cap = start_capital
+    k = -1
+    count = 0
+    entry = sl = target = 0.0
+    trail = False
+
+    for i in range(n):
+        p = premium[i]
+        if k < 0 and signal[i] != 0:
+            k = count
+            count += 1
+            entry_idx[k] = i
+            entry = entry_px[i]
+            sl = sl_px[i]
+            target = target_px[i]
+            trail = False
+
+        if k >= 0:
+            if not trail and p >= entry * 1.1:
+                sl = entry
+                trail = True
+            if trail:
+                sl = max(sl, p * 0.95)
+
+            status = 0
+            if p <= sl:
+                status = 1
+            if p >= target:
+                status = 2
+
+            sl_out[k] = sl
+            trail_out[k] = trail
+            status_out[k] = status
+            if status != 0:
+                cap += p - entry
+                exit_idx[k] = i
+                k = -1
+
+        capital[i] = cap
+        trade_id[i] = k
+
+    return (
+        capital, trade_id, entry_idx[:count], exit_idx[:count],
+        sl_out[:count], trail_out[:count], status_out[:count],
+    )
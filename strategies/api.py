@@ -0,0 +1,192 @@
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+import yfinance as yf
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from ._njit import _all_indicators
+
+app = FastAPI(title="Trading Backend API", default_response_class=ORJSONResponse)
+
+# Symbols mapping
+SYMBOL_MAP = {
+    "NIFTY": "^NSEI",
+    "BANKNIFTY": "^NSEBANK",
+    "FINNIFTY": "FINNIFTY.NS"  # adjust Yahoo Finance symbol if needed
+}
+
+
+def safe_float(val):
+    """Convert value to float or None if NaN/Inf"""
+    if pd.isna(val) or val is None:
+        return None
+    val = float(val)
+    if val != val or val == float("inf") or val == float("-inf"):
+        return None
+    return val
+
+
+# Columns added by _all_indicators, in the order it returns them
+INDICATOR_COLUMNS = (
+    "EMA9", "EMA21", "VWAP",
+    "MACD", "MACD_SIGNAL", "MACD_HIST",
+    "RSI", "BB_UPPER", "BB_LOWER",
+)
+
+# JSON key -> DataFrame column for the chart endpoints
+CANDLE_FIELDS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "ema9": "EMA9",
+    "ema21": "EMA21",
+    "vwap": "VWAP",
+    "macd": "MACD",
+    "macdSignal": "MACD_SIGNAL",
+    "macdHist": "MACD_HIST",
+    "rsi": "RSI",
+    "bbUpper": "BB_UPPER",
+    "bbLower": "BB_LOWER",
+    "volume": "Volume",
+}
+
+
+def float_column(df, col):
+    """Column as a list of floats, None where missing/NaN/Inf"""
+    if col not in df.columns:
+        return [None] * len(df)
+    arr = df[col].to_numpy(dtype=np.float64)
+    return np.where(np.isfinite(arr), arr, None).tolist()
+
+
+def candle_columns(df):
+    """Columnar candles: {"time": [...], "open": [...], ...}"""
+    columns = {"time": [t.isoformat() for t in df.index]}
+    for key, col in CANDLE_FIELDS.items():
+        columns[key] = float_column(df, col)
+    return columns
+
+
+def fetch_data(yf_symbol: str, interval="5m", period="7d"):
+    """
+    Fetch candle data from Yahoo Finance.
+    Fallback to daily candles if 5-min data is empty or insufficient.
+    """
+    df = yf.Ticker(yf_symbol).history(period=period, interval=interval)
+    return _prepare_data(yf_symbol, df, interval)
+
+
+def fetch_many(yf_symbols, interval="5m", period="7d"):
+    """
+    Fetch candle data for several symbols concurrently.
+    Returns {yf_symbol: DataFrame or None}, same per-symbol rules as fetch_data.
+    """
+    # One Ticker.history per symbol rather than a batched yf.download:
+    # download() resets and polls module-global state, so concurrent
+    # requests can wipe or mix each other's frames.
+    yf_symbols = list(yf_symbols)
+    with ThreadPoolExecutor(max_workers=len(yf_symbols) or 1) as pool:
+        frames = pool.map(lambda s: fetch_data(s, interval, period), yf_symbols)
+        return dict(zip(yf_symbols, frames))
+
+
+def _prepare_data(yf_symbol: str, df, interval):
+    """Apply the daily fallback, trading-hours filter and indicators to raw candles."""
+    # Fallback to daily if empty or too few rows
+    if df.empty or len(df) < 50:
+        df = yf.Ticker(yf_symbol).history(period="50d", interval="1d")
+
+    if df.empty or "Close" not in df.columns:
+        return None
+
+    # For intraday, filter trading hours
+    if interval != "1d":
+        try:
+            df = df.tz_convert("Asia/Kolkata")
+            df = df.between_time("09:15", "15:30")
+        except Exception:
+            pass  # skip if tz_convert fails
+
+    # ================= INDICATORS =================
+    indicators = _all_indicators(
+        df["High"].to_numpy(dtype=np.float64),
+        df["Low"].to_numpy(dtype=np.float64),
+        df["Close"].to_numpy(dtype=np.float64),
+        df["Volume"].to_numpy(dtype=np.float64),
+    )
+    df = df.assign(**dict(zip(INDICATOR_COLUMNS, indicators)))
+    # =================================================
+
+    return df
+
+
+@app.get("/")
+def home():
+    return {"status": "Trading backend running"}
+
+
+@app.get("/chart/{symbol}")
+def chart_symbol(symbol: str):
+    yf_symbol = SYMBOL_MAP.get(symbol.upper())
+    if not yf_symbol:
+        return {"data": {}, "error": "Invalid symbol"}
+
+    df = fetch_data(yf_symbol)
+    if df is None or df.empty:
+        return {"data": {}, "error": "No usable data for this symbol"}
+
+    # For intraday, show only last day
+    # (normalize() stays datetime64; index.date would box every row)
+    days = df.index.normalize()
+    df = df[days == days[-1]]
+
+    return {"data": candle_columns(df)}
+
+
+@app.get("/chart/{symbol}/recent")
+def chart_recent(symbol: str, interval: str = "5m", limit: int = 50):
+    """
+    Return last `limit` candles for a symbol.
+    interval: "5m" or "1d"
+    """
+    yf_symbol = SYMBOL_MAP.get(symbol.upper())
+    if not yf_symbol:
+        return {"data": {}, "error": "Invalid symbol"}
+
+    df = fetch_data(yf_symbol, interval=interval, period="7d")
+    if df is None or df.empty:
+        return {"data": {}, "error": "No usable data for this symbol"}
+
+    df = df.tail(limit)
+
+    return {"data": candle_columns(df)}
+
+
+@app.get("/data")
+def all_data():
+    """Return latest candle + indicators for all symbols"""
+    frames = fetch_many(SYMBOL_MAP.values())
+    result = {}
+    for symbol, yf_symbol in SYMBOL_MAP.items():
+        df = frames[yf_symbol]
+        if df is None or df.empty:
+            result[symbol] = {"error": "No usable data"}
+            continue
+
+        last = df.iloc[-1]
+        result[symbol] = {
+            "close": safe_float(last["Close"]),
+            "ema9": safe_float(last.get("EMA9")),
+            "ema21": safe_float(last.get("EMA21")),
+            "vwap": safe_float(last.get("VWAP")),
+            "macd": safe_float(last.get("MACD")),
+            "macdSignal": safe_float(last.get("MACD_SIGNAL")),
+            "macdHist": safe_float(last.get("MACD_HIST")),
+            "rsi": safe_float(last.get("RSI")),
+            "bbUpper": safe_float(last.get("BB_UPPER")),
+            "bbLower": safe_float(last.get("BB_LOWER")),
+            "volume": safe_float(last.get("Volume")),
+        }
+    return result
@@ -0,0 +1,143 @@
+import numpy as np
+from datetime import date, timedelta
+
+from ._njit import _ema_rsi, _fsm
+
+# Option backtest building blocks used by the /chart/{symbol} endpoint in main.py
+
+STRIKE_STEP = {
+    "NIFTY": 50,
+    "FINNIFTY": 50,
+    "BANKNIFTY": 100
+}
+
+# ================= UTIL =================
+
+def column_arrays(df, *cols):
+    # Float64 copies (frames are shared via the cache, and capital/P&L
+    # accounting wants full precision) with +/-inf -> NaN;
+    # NaN is the "missing" sentinel from here on.
+    arrs = [np.array(df[c], dtype=np.float64) for c in cols]
+    for a in arrs:
+        np.nan_to_num(a, copy=False, nan=np.nan, posinf=np.nan, neginf=np.nan)
+    return arrs
+
+def nearest_strike(price, step):
+    # Vectorized over a price array; np.round rounds half to even like round()
+    return np.round(price / step) * step
+
+_EXPIRY_CACHE = {}  # date -> formatted expiry, only today's entry is kept
+
+def next_expiry():
+    today = date.today()
+    cached = _EXPIRY_CACHE.get(today)
+    if cached:
+        return cached
+
+    days = (3 - today.weekday()) % 7
+    if days == 0:
+        days = 7
+    expiry = (today + timedelta(days=days)).strftime("%d-%b-%Y")
+    _EXPIRY_CACHE.clear()
+    _EXPIRY_CACHE[today] = expiry
+    return expiry
+
+# ================= INDICATORS =================
+
+def add_indicators(df):
+    close = df["Close"].to_numpy(dtype=np.float64)
+    ema9, ema21, rsi = _ema_rsi(close, 9, 21, 14)
+    return df.assign(EMA9=ema9, EMA21=ema21, RSI=rsi)
+
+# ================= STRATEGY =================
+
+# Signals are int8: +1 BUY, -1 SELL, 0 NONE
+SIGNAL_NAMES = ("NONE", "BUY", "SELL")  # indexed by signal, -1 wraps to SELL
+
+def ema_signal(ema9, ema21):
+    sig = np.zeros(len(ema9), dtype=np.int8)
+    up = (ema9[:-1] < ema21[:-1]) & (ema9[1:] > ema21[1:])
+    down = (ema9[:-1] > ema21[:-1]) & (ema9[1:] < ema21[1:])
+    sig[1:] = np.where(up, 1, np.where(down, -1, 0))
+    return sig
+
+def rsi_filter(rsi):
+    # NaN RSI compares False on both sides -> no signal
+    return np.where(rsi < 30, 1, np.where(rsi > 70, -1, 0)).astype(np.int8)
+
+def final_signal(ema9, ema21, rsi):
+    s1 = ema_signal(ema9, ema21)
+    s2 = rsi_filter(rsi)
+    return np.where(s1 == s2, s1, 0).astype(np.int8)
+
+# ================= OPTION LOGIC =================
+
+def option_premium(spot):
+    # fmax so a NaN spot still prices at the 40 floor
+    return np.fmax(40.0, spot * 0.004)
+
+def option_delta(option_type):
+    return 0.55 if option_type == "CE" else -0.55
+
+def pick_strike(spot, step, mode):
+    atm = nearest_strike(spot, step)
+    if mode == "ATM":
+        return atm
+    if mode == "ITM":
+        return atm - step
+    if mode == "OTM":
+        return atm + step
+    return atm
+
+def delta_filter(signals):
+    # Drop entries whose option delta is too small to trade.
+    # option_delta() is a constant +/-0.55 today, so this is a no-op.
+    ce_ok = abs(option_delta("CE")) >= 0.4
+    pe_ok = abs(option_delta("PE")) >= 0.4
+    return np.where(np.where(signals > 0, ce_ok, pe_ok), signals, 0).astype(np.int8)
+
+TRADE_STATUS = ("OPEN", "SL HIT", "TARGET HIT")  # indexed by _fsm status code
+
+def start_option_trade(signal, strike, premium, symbol, expiry):
+    # Python float: round() on np.float64 rounds differently (118.245 -> 118.24)
+    premium = float(premium)
+    return {
+        "symbol": symbol,
+        "expiry": expiry,
+        "strike": int(strike),
+        "type": "CE" if signal > 0 else "PE",
+        "entry": round(premium, 2),
+        "sl": round(premium * 0.7, 2),
+        "target": round(premium * 1.5, 2),
+        "trail": False,
+        "status": "OPEN"
+    }
+
+def run_trades(signals, premiums, strikes, symbol, start_capital):
+    # Trade management runs in the _fsm kernel; dicts are only built for
+    # the trades it reports.
+    # Entry levels rounded with Python's round() on floats, as
+    # start_option_trade() does, so the kernel trades on the same prices.
+    prices = premiums.tolist()
+    entry_px = np.array([round(p, 2) for p in prices])
+    sl_px = np.array([round(p * 0.7, 2) for p in prices])
+    target_px = np.array([round(p * 1.5, 2) for p in prices])
+
+    capitals, trade_ids, entry_idx, exit_idx, sls, trails, statuses = _fsm(
+        delta_filter(signals), premiums, entry_px, sl_px, target_px, float(start_capital)
+    )
+
+    expiry = next_expiry()
+    trades = []
+    journal = []
+    for k, i in enumerate(entry_idx.tolist()):
+        trade = start_option_trade(signals[i], strikes[i], premiums[i], symbol, expiry)
+        trade.update(sl=float(sls[k]), trail=bool(trails[k]), status=TRADE_STATUS[statuses[k]])
+        trades.append(trade)
+
+        if exit_idx[k] >= 0:
+            exit_premium = float(premiums[exit_idx[k]])
+            pnl = exit_premium - trade["entry"]
+            journal.append({**trade, "exit": round(exit_premium, 2), "pnl": round(pnl, 2)})
+
+    return capitals, trade_ids, trades, journal